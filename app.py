@@ -1,7 +1,28 @@
 import streamlit as st
-from src.driver import Driver
+from src.driver import Driver, warm_up
 import os
 from RAG_Logger import logger
+from src.clients import load_env
+from src.snapshot.index_snapshot import current_snapshot_id
+
+load_env()
+
+# Optional directory of index snapshots shared between nodes
+SNAPSHOT_DIR = os.getenv("RAG_SNAPSHOT_DIR")
+
+# Warm up heavy backends in the background once the first page has rendered (set to 0 to disable)
+BACKGROUND_WARM_UP = os.getenv("RAG_BACKGROUND_WARM_UP", "1") != "0"
+
+@st.cache_resource
+def get_snapshot_driver(snapshot_dir):
+    """Start a Driver from the current index snapshot, shared by all sessions of this process"""
+    logger.info(f"Starting from index snapshot in: {snapshot_dir}")
+    return Driver(snapshot_path=snapshot_dir)
+
+@st.cache_resource
+def start_warm_up(include_pipeline):
+    """Start the background warm-up once per process"""
+    return warm_up(build_clients=True, background=True, include_pipeline=include_pipeline)
 
 def initialize_session_state():
     """Initialize session state variables if they don't exist"""
@@ -9,9 +30,29 @@ def initialize_session_state():
         st.session_state.rag_chain = None
     if 'pdf_loaded' not in st.session_state:
         st.session_state.pdf_loaded = False
+    if 'chain_source' not in st.session_state:
+        st.session_state.chain_source = None
+    if 'processed_file_id' not in st.session_state:
+        st.session_state.processed_file_id = None
+
+def load_shared_index():
+    """Attach the shared index snapshot to this session if one is published"""
+    if SNAPSHOT_DIR and current_snapshot_id(SNAPSHOT_DIR):
+        try:
+            driver_instance = get_snapshot_driver(SNAPSHOT_DIR)
+            # Pick up snapshots published by other nodes without a restart
+            driver_instance.refresh_snapshot()
+            # Sessions that uploaded their own PDF keep their own chain
+            if not st.session_state.pdf_loaded:
+                st.session_state.rag_chain = driver_instance.get_rag_chain()
+                st.session_state.pdf_loaded = True
+                st.session_state.chain_source = "snapshot"
+        except Exception as e:
+            logger.error(f"Error loading index snapshot: {str(e)}")
 
 def process_uploaded_file(uploaded_file):
     """Process the uploaded PDF file"""
+    file_path = None
     try:
         logger.info(f"Processing uploaded file: {uploaded_file.name}")
         
@@ -29,9 +70,16 @@ def process_uploaded_file(uploaded_file):
         driver_instance = Driver()
         st.session_state.rag_chain = driver_instance.get_rag_chain()
         st.session_state.pdf_loaded = True
-        
-        # Clean up
-        os.remove(file_path)
+        st.session_state.chain_source = "upload"
+        st.session_state.processed_file_id = uploaded_file.file_id
+
+        # Publish the index so other nodes can start from it; failing to do so
+        # does not affect this session, which already has its RAG chain
+        if SNAPSHOT_DIR:
+            try:
+                driver_instance.export_snapshot(SNAPSHOT_DIR)
+            except Exception as e:
+                logger.error(f"Error exporting index snapshot: {str(e)}")
         
         logger.info("Successfully processed PDF and initialized RAG chain")
         return True
@@ -40,6 +88,41 @@ def process_uploaded_file(uploaded_file):
         logger.error(f"Error processing PDF: {str(e)}")
         return False
 
+    finally:
+        # Clean up so the next Driver() does not process this PDF again
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+
+def render_question_section():
+    """Render the question answering section for sessions with a RAG chain"""
+    if not st.session_state.pdf_loaded:
+        return
+
+    st.subheader("Ask a Question 💭")
+    if st.session_state.chain_source == "snapshot":
+        st.caption("Answering from the shared index. Upload a PDF to ask about your own document instead; "
+                   "it will also be published as the new shared index.")
+    
+    # Question input
+    question = st.text_input("Enter your question:")
+    
+    if st.button("Get Answer 🔍"):
+        if question:
+            try:
+                with st.spinner("Generating answer..."):
+                    logger.info(f"Processing question: {question}")
+                    response = st.session_state.rag_chain.invoke({"question": question})
+                    
+                    # Display response
+                    st.subheader("Answer 💡:")
+                    st.markdown(response)
+                    
+            except Exception as e:
+                logger.error(f"Error generating answer: {str(e)}")
+                st.error("Error generating answer. Please try again.")
+        else:
+            st.warning("Please enter a question.⚠️")
+
 def main():
     st.title("Anthropic's Contextual RAG 🤖")
     st.divider()
@@ -52,7 +135,8 @@ def main():
     st.subheader("Upload PDF")
     uploaded_file = st.file_uploader("Choose a PDF file", type="pdf")
     
-    if uploaded_file is not None and not st.session_state.pdf_loaded:
+    # A new upload replaces the current chain, including one backed by the shared index
+    if uploaded_file is not None and uploaded_file.file_id != st.session_state.processed_file_id:
         with st.spinner("Processing PDF...⏳"):
             success = process_uploaded_file(uploaded_file)
             if success:
@@ -60,29 +144,8 @@ def main():
             else:
                 st.error("Error processing PDF. Please try again. ❌")
     
-    # Question answering section
-    if st.session_state.pdf_loaded:
-        st.subheader("Ask a Question 💭")
-        
-        # Question input
-        question = st.text_input("Enter your question:")
-        
-        if st.button("Get Answer 🔍"):
-            if question:
-                try:
-                    with st.spinner("Generating answer..."):
-                        logger.info(f"Processing question: {question}")
-                        response = st.session_state.rag_chain.invoke({"question": question})
-                        
-                        # Display response
-                        st.subheader("Answer 💡:")
-                        st.markdown(response)
-                        
-                except Exception as e:
-                    logger.error(f"Error generating answer: {str(e)}")
-                    st.error("Error generating answer. Please try again.")
-            else:
-                st.warning("Please enter a question.⚠️")
+    # Question answering section, filled in once the rest of the page has rendered
+    question_section = st.container()
     
     # Instructions
     with st.sidebar:
@@ -105,6 +168,17 @@ def main():
         """)
         
         st.write("Made with ❤️ by [Krish Goyani](https://github.com/Krish-Goyani)")
+
+    # Load the shared index only after the title, uploader and sidebar have been sent
+    with question_section:
+        with st.spinner("Loading shared index...⏳"):
+            load_shared_index()
+        render_question_section()
+
+    if BACKGROUND_WARM_UP:
+        # Nodes serving from a snapshot only run the full pipeline if someone uploads a PDF
+        serving_from_snapshot = bool(SNAPSHOT_DIR and current_snapshot_id(SNAPSHOT_DIR))
+        start_warm_up(include_pipeline=not serving_from_snapshot)
     
     
 
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+"""
+Startup benchmark for the app.
+
+Measures, each in a fresh interpreter:
+  - import of src.driver, with a `python -X importtime` breakdown of the slowest modules
+  - time to first render of app.py: from the start of the script run until it has rendered
+    once, using Streamlit's AppTest runner so no browser is needed. Streamlit itself is
+    imported before the timer starts, as the server does under `streamlit run`.
+  - the same first render on a node serving from an index snapshot (RAG_SNAPSHOT_DIR),
+    using a synthetic snapshot with random embeddings, until the question box has rendered
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --output bench.json
+    python benchmarks/startup_benchmark.py --baseline bench.json
+    python benchmarks/startup_benchmark.py --snapshot-chunks 0   # skip snapshot mode
+"""
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+FIRST_RENDER_SCRIPT = """
+import time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app_path!r}, default_timeout=120)
+start = time.perf_counter()
+app.run()
+elapsed = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(f"app.py raised: {{app.exception}}")
+print(elapsed)
+"""
+
+
+def _run(args, env=None, cwd=None):
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=cwd or REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+
+def _benchmark_env():
+    env = os.environ.copy()
+    # Measure the page itself, not the background warm-up it starts afterwards
+    env["RAG_BACKGROUND_WARM_UP"] = "0"
+    return env
+
+
+def measure_import(module: str, top: int = 15) -> dict:
+    """
+    Import a module with -X importtime and collect the total and its slowest direct imports.
+    """
+    result = _run(["-X", "importtime", "-c", f"import {module}"], env=_benchmark_env())
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": (len(indent) - 1) // 2
+            })
+
+    # importtime prints children before their parent, so the direct imports of the target
+    # are the lines just above it that are one level deeper
+    target_index = next((i for i in reversed(range(len(modules))) if modules[i]["module"] == module), None)
+    target = modules[target_index] if target_index is not None else None
+    top_level = []
+    if target is not None:
+        for entry in reversed(modules[:target_index]):
+            if entry["depth"] <= target["depth"]:
+                break
+            if entry["depth"] == target["depth"] + 1:
+                top_level.append(entry)
+    top_level.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+
+    return {
+        "module": module,
+        "total_ms": target["cumulative_ms"] if target else None,
+        "modules_imported": len(modules),
+        "slowest": top_level[:top]
+    }
+
+
+def build_synthetic_snapshot(snapshot_root: str, num_chunks: int, dimension: int = 768) -> None:
+    """
+    Export a snapshot of num_chunks synthetic chunks with random embeddings, without API calls.
+    """
+    import numpy as np
+    from langchain_core.documents import Document
+    from src.retriever.BM25_retriever import get_BM25_retriever
+    from src.snapshot.index_snapshot import export_snapshot
+
+    words = ["retrieval", "context", "chunk", "embedding", "ranking", "document", "query", "index"]
+    docs = [
+        Document(
+            page_content=f"Context for chunk {i}.\n\n" + " ".join(words[(i + j) % len(words)] for j in range(100)),
+            metadata={"source": "synthetic.pdf", "page": i // 10, "generated_context": f"Context for chunk {i}."}
+        )
+        for i in range(num_chunks)
+    ]
+    embeddings = np.random.default_rng(0).normal(size=(num_chunks, dimension))
+    export_snapshot(snapshot_root, docs, embeddings, get_BM25_retriever(docs).vectorizer)
+
+
+def measure_first_render(repeat: int, snapshot_dir: str = None) -> dict:
+    """
+    Time for the first run of app.py to render, each in a fresh process with Streamlit preloaded.
+    With snapshot_dir the app serves from that snapshot, as a node with RAG_SNAPSHOT_DIR does.
+    """
+    script = FIRST_RENDER_SCRIPT.format(app_path=os.path.join(REPO_ROOT, "app.py"))
+    env = _benchmark_env()
+    cwd = None
+    if snapshot_dir:
+        env["RAG_SNAPSHOT_DIR"] = snapshot_dir
+        # Only checked for presence; no API calls are made while rendering
+        env.setdefault("GOOGLE_API_KEY", "benchmark")
+        env["PYTHONPATH"] = REPO_ROOT
+        # Keep the logs/ the app writes while loading the snapshot out of the repo
+        cwd = os.path.dirname(snapshot_dir)
+
+    samples = []
+    for _ in range(repeat):
+        result = _run(["-c", script], env=env, cwd=cwd)
+        samples.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+
+    return {
+        "samples_ms": samples,
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples)
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_comparison(name, current, baseline):
+    if current is None or baseline is None:
+        return
+    change = (current - baseline) / baseline * 100 if baseline else 0.0
+    print(f"  {name}: {baseline:.1f} ms -> {current:.1f} ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first render of the app")
+    parser.add_argument("--module", default="src.driver", help="Module to profile with -X importtime")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes used for the first render timing")
+    parser.add_argument("--skip-render", action="store_true", help="Only measure the import")
+    parser.add_argument("--snapshot-chunks", type=int, default=20000,
+                        help="Chunks in the synthetic snapshot for the snapshot-mode render, 0 to skip")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "import": measure_import(args.module, args.top)
+    }
+
+    print(f"Import of {args.module}: {results['import']['total_ms']:.1f} ms "
+          f"({results['import']['modules_imported']} modules)")
+    print(f"Slowest direct imports of {args.module} (cumulative):")
+    for entry in results["import"]["slowest"]:
+        print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+
+    if not args.skip_render:
+        results["first_render"] = measure_first_render(args.repeat)
+        print(f"Time to first render: median {results['first_render']['median_ms']:.1f} ms, "
+              f"min {results['first_render']['min_ms']:.1f} ms over {args.repeat} runs")
+
+    if not args.skip_render and args.snapshot_chunks:
+        work_dir = tempfile.mkdtemp(prefix="startup-benchmark-")
+        try:
+            snapshot_dir = os.path.join(work_dir, "snapshots")
+            build_synthetic_snapshot(snapshot_dir, args.snapshot_chunks)
+            results["first_render_snapshot"] = {
+                "num_chunks": args.snapshot_chunks,
+                **measure_first_render(args.repeat, snapshot_dir=snapshot_dir)
+            }
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        print(f"Time to first render from a {args.snapshot_chunks}-chunk snapshot: "
+              f"median {results['first_render_snapshot']['median_ms']:.1f} ms, "
+              f"min {results['first_render_snapshot']['min_ms']:.1f} ms over {args.repeat} runs")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared to {args.baseline}:")
+        _print_comparison("import", results["import"]["total_ms"], baseline.get("import", {}).get("total_ms"))
+        _print_comparison(
+            "first render",
+            results.get("first_render", {}).get("median_ms"),
+            baseline.get("first_render", {}).get("median_ms")
+        )
+        _print_comparison(
+            "first render (snapshot)",
+            results.get("first_render_snapshot", {}).get("median_ms"),
+            baseline.get("first_render_snapshot", {}).get("median_ms")
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,11 @@
-from langchain_core.documents import Document
-from typing import List
-from langchain_cohere import CohereRerank
-import os  
+from typing import TYPE_CHECKING, List
+from src.clients import get_reranker
 from RAG_Logger import logger
-from dotenv import load_dotenv
 
-load_dotenv()
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
 
-def rerank_documents(documents: List[Document], query: str, top_n: int = 5) -> str:
+def rerank_documents(documents: List["Document"], query: str, top_n: int = 5) -> str:
   """
   Rerank documents using Cohere and return document contents.
   
@@ -26,19 +24,13 @@ def rerank_documents(documents: List[Document], query: str, top_n: int = 5) -> s
         logger.warning("No documents provided for reranking")
         return ""
         
-    # Get API key
-    cohere_api_key = os.getenv("COHERE_API_KEY")
-    if not cohere_api_key:
-        raise ValueError("COHERE_API_KEY environment variable not found")
+    from langchain_core.documents import Document
 
     # Extract text from documents
     texts = [doc.page_content for doc in documents]
 
 
-    reranker = CohereRerank(
-                    cohere_api_key=os.getenv("COHERE_API_KEY"),
-                    model="rerank-english-v3.0"
-                )
+    reranker = get_reranker("rerank-english-v3.0")
     
     # Perform reranking
     try:
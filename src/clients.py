@@ -0,0 +1,119 @@
+from functools import lru_cache, wraps
+from RAG_Logger import logger
+import inspect
+import os
+import threading
+
+"""
+Deferred construction of the external clients (Gemini, Pinecone, Cohere).
+
+Backends are imported and clients built on first use, then reused for the
+lifetime of the process, so importing the package stays cheap. Construction is
+serialised by a lock so the background warm-up and a request thread never build
+the same client twice.
+"""
+
+_client_lock = threading.RLock()
+
+
+def _cached_client(factory):
+    """
+    lru_cache a client factory and hold a process-wide lock while it runs,
+    since lru_cache alone lets two threads construct the same client concurrently.
+    Arguments are bound to the signature with defaults applied first, so get_llm()
+    and get_llm("gemini-1.5-flash") share one cached client.
+    """
+    cached_factory = lru_cache(maxsize=None)(factory)
+    signature = inspect.signature(factory)
+
+    @wraps(factory)
+    def get_client(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        with _client_lock:
+            return cached_factory(*bound.args, **bound.kwargs)
+
+    get_client.cache_clear = cached_factory.cache_clear
+    get_client.cache_info = cached_factory.cache_info
+    return get_client
+
+
+@_cached_client
+def load_env() -> None:
+    """
+    Load variables from .env once, on first use instead of at import time.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def get_api_key(name: str) -> str:
+    """
+    Read an API key from the environment, loading .env first.
+
+    Args:
+        name (str): Name of the environment variable
+
+    Returns:
+        str: The API key
+    """
+    load_env()
+    api_key = os.getenv(name)
+    if not api_key:
+        raise ValueError(f"{name} environment variable not found")
+    return api_key
+
+
+@_cached_client
+def get_llm(model: str = "gemini-1.5-flash"):
+    """
+    Gemini completion model used to answer questions.
+    """
+    from langchain_google_genai import GoogleGenerativeAI
+
+    logger.debug(f"Initializing LLM: {model}")
+    return GoogleGenerativeAI(model=model, api_key=get_api_key("GOOGLE_API_KEY"))
+
+
+@_cached_client
+def get_chat_llm(model: str = "gemini-1.5-flash"):
+    """
+    Gemini chat model used to generate chunk contexts.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    logger.debug(f"Initializing chat LLM: {model}")
+    return ChatGoogleGenerativeAI(google_api_key=get_api_key("GOOGLE_API_KEY"), model=model)
+
+
+@_cached_client
+def get_embedding_model(model: str = "models/embedding-001"):
+    """
+    Google embedding model used for both chunk and query embeddings.
+    """
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    logger.debug(f"Initializing embedding model: {model}")
+    return GoogleGenerativeAIEmbeddings(model=model, google_api_key=get_api_key("GOOGLE_API_KEY"))
+
+
+@_cached_client
+def get_pinecone_client():
+    """
+    Pinecone control-plane client.
+    """
+    from pinecone import Pinecone
+
+    logger.debug("Connecting to Pinecone")
+    return Pinecone(api_key=get_api_key("PINECONE_API_KEY"))
+
+
+@_cached_client
+def get_reranker(model: str = "rerank-english-v3.0"):
+    """
+    Cohere reranker used to order retrieved chunks.
+    """
+    from langchain_cohere import CohereRerank
+
+    logger.debug(f"Initializing reranker: {model}")
+    return CohereRerank(cohere_api_key=get_api_key("COHERE_API_KEY"), model=model)
@@ -1,20 +1,17 @@
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-from langchain.schema import Document
+from src.clients import get_chat_llm
 from RAG_Logger import logger
-from typing import List
+from typing import TYPE_CHECKING, List
 import time
-from dotenv import load_dotenv
-import os
-load_dotenv()
+
+if TYPE_CHECKING:
+    from langchain.schema import Document
 
 def enrich_chunks_with_context(
-    documents: List[Document],
+    documents: List["Document"],
     chunk_size: int = 700,
     chunk_overlap: int = 200,
     model_name: str = "gemini-1.5-flash"
-    ) -> List[Document]:
+    ) -> List["Document"]:
     """
     Processes documents by splitting them into chunks and adding AI-generated context summaries.
     
@@ -32,6 +29,9 @@ def enrich_chunks_with_context(
     try:
         logger.info(f"Starting chunk enrichment process with {len(documents)} documents")
         logger.debug(f"Parameters - chunk_size: {chunk_size}, chunk_overlap: {chunk_overlap}, model: {model_name}")
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from langchain.prompts import PromptTemplate
+        from langchain.schema import Document
 
 
         # Initialize the text splitter
@@ -41,15 +41,7 @@ def enrich_chunks_with_context(
         )
 
         # Initialize the LLM
-        google_api_key = os.getenv('GOOGLE_API_KEY')
-        if not google_api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable not found")
-
-
-        llm = ChatGoogleGenerativeAI(
-            google_api_key=google_api_key,
-            model=model_name
-        )
+        llm = get_chat_llm(model_name)
         
         # Create prompt template
         prompt_template = PromptTemplate(
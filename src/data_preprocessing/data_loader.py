@@ -1,7 +1,4 @@
-from langchain_community.document_loaders import DirectoryLoader
 from RAG_Logger import logger
-from langchain_community.document_loaders import DirectoryLoader
-from langchain_community.document_loaders import PyPDFLoader
 from typing import List, Optional
 
 
@@ -17,6 +14,7 @@ def load_pdf_documents(directory_path: str) -> Optional[List]:
     """
     try:
         logger.info(f"Starting to load PDF documents from: {directory_path}")
+        from langchain_community.document_loaders import DirectoryLoader, PyPDFLoader
         
         # Initialize DirectoryLoader with PDF loader
         loader = DirectoryLoader(
@@ -1,32 +1,201 @@
-from langchain_google_genai import GoogleGenerativeAI
-from langchain_core.documents import Document
-from langchain_core.runnables import RunnablePassthrough
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import PromptTemplate
 from src.data_preprocessing.data_loader import load_pdf_documents
 from src.data_preprocessing.chunk_enriching import enrich_chunks_with_context
 from src.retriever.pinecon_retriever import get_pinecone_retriever
-from src.retriever.BM25_retriever import get_BM25_retriever
+from src.retriever.BM25_retriever import get_BM25_retriever, get_BM25_retriever_from_index
 from src.retriever.ensemble_retriever import get_ensemble_retriever
 from src.Ranking.re_ranker import rerank_documents
+from src.snapshot.index_snapshot import export_snapshot, load_snapshot, current_snapshot_id
+from src.clients import get_api_key, get_chat_llm, get_embedding_model, get_llm, get_pinecone_client, get_reranker
 from RAG_Logger import logger
-import os   
-from dotenv import load_dotenv
+from typing import Optional
+import importlib
+import threading
+import os
 
-load_dotenv()
+# Heavy backends deferred until first use, in the order they are needed
+WARM_UP_MODULES = (
+    "langchain_core.prompts",
+    "langchain_core.runnables",
+    "langchain_core.output_parsers",
+    "langchain_community.document_loaders",
+    "langchain_community.retrievers",
+    "langchain.retrievers",
+    "langchain.text_splitter",
+    "langchain_google_genai",
+    "langchain_cohere",
+    "numpy",
+    "src.retriever.snapshot_retriever",
+)
+
+# Only needed to process an upload through the full pipeline, not to serve from a snapshot
+PIPELINE_WARM_UP_MODULES = (
+    "langchain_pinecone",
+    "pinecone",
+)
+
+def warm_up(build_clients: bool = False, background: bool = True, include_pipeline: bool = True) -> Optional[threading.Thread]:
+    """
+    Import the heavy backends (and optionally construct the API clients) ahead of first use.
+    Safe to run alongside requests: Python's per-module import locks make a concurrent
+    import of the same module wait for the first one, and client construction is locked.
+
+    Args:
+        build_clients (bool): Also construct the answering LLM, embedding and Cohere clients
+        background (bool): Run in a daemon thread instead of blocking the caller
+        include_pipeline (bool): Also warm up what only the full pipeline uses (Pinecone and the
+            chunk-enrichment chat model); skip it on nodes serving from a snapshot
+
+    Returns:
+        Optional[threading.Thread]: The warm-up thread when running in the background
+    """
+    def _warm_up():
+        logger.info("Starting warm-up of RAG backends")
+        module_names = WARM_UP_MODULES + (PIPELINE_WARM_UP_MODULES if include_pipeline else ())
+        for module_name in module_names:
+            try:
+                importlib.import_module(module_name)
+            except Exception as e:
+                logger.warning(f"Warm-up failed to import {module_name}: {str(e)}")
+
+        if build_clients:
+            client_factories = [get_llm, get_embedding_model, get_reranker]
+            if include_pipeline:
+                client_factories += [get_chat_llm, get_pinecone_client]
+            for get_client in client_factories:
+                try:
+                    get_client()
+                except Exception as e:
+                    logger.warning(f"Warm-up failed to build client {get_client.__name__}: {str(e)}")
+        logger.info("Warm-up of RAG backends completed")
+
+    if not background:
+        _warm_up()
+        return None
+
+    thread = threading.Thread(target=_warm_up, name="rag-warm-up", daemon=True)
+    thread.start()
+    return thread
 
 class Driver:
-    def __init__(self):
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.snapshot_root = None
+        self.snapshot_id = None
+        self.embeddings = None
+        self._snapshot_lock = threading.Lock()
+        # Snapshots that failed to load, so refreshes do not retry them on every rerun
+        self._failed_snapshot_ids = set()
+
+        if snapshot_path:
+            # Cold start from a prebuilt snapshot: no loading, enrichment, embedding or indexing
+            self.snapshot_root = snapshot_path
+            self.load_from_snapshot(snapshot_path)
+            return
+
         self.docs = load_pdf_documents(directory_path="local_database")
 
         self.enriched_docs = enrich_chunks_with_context(self.docs)
 
-        self.pinecone_retriever = get_pinecone_retriever(index_name="contextual-embeddings", chunks=self.enriched_docs)
+        # Embed once; the same vectors go to Pinecone and to any exported snapshot
+        logger.info(f"Embedding {len(self.enriched_docs)} chunks")
+        self.embeddings = get_embedding_model().embed_documents(
+            [doc.page_content for doc in self.enriched_docs]
+        )
+
+        self.pinecone_retriever = get_pinecone_retriever(
+            index_name="contextual-embeddings",
+            chunks=self.enriched_docs,
+            chunk_embeddings=self.embeddings
+        )
 
         self.bm25_retriever = get_BM25_retriever(docs=self.enriched_docs)
 
         self.ensemble_retriever = get_ensemble_retriever(self.pinecone_retriever, self.bm25_retriever)
 
+    def load_from_snapshot(self, snapshot_path: str, verify: bool = False):
+        """
+        Build the retrievers from an index snapshot and swap them in.
+        Queries in flight keep using the previous retrievers, so this can be called on a live node.
+        """
+        with self._snapshot_lock:
+            self._swap_in_snapshot(snapshot_path, verify=verify)
+
+    def _swap_in_snapshot(self, snapshot_path: str, verify: bool = False):
+        # Callers must hold _snapshot_lock
+        from src.retriever.snapshot_retriever import get_snapshot_dense_retriever
+
+        snapshot = load_snapshot(snapshot_path, verify=verify)
+
+        dense_retriever = get_snapshot_dense_retriever(
+            docs=snapshot.docs,
+            embeddings=snapshot.embeddings,
+            embedding_model=snapshot.manifest["embedding_model"]
+        )
+        bm25_retriever = get_BM25_retriever_from_index(snapshot.bm25_vectorizer, docs=snapshot.docs)
+        ensemble_retriever = get_ensemble_retriever(dense_retriever, bm25_retriever)
+        if ensemble_retriever is None:
+            raise ValueError(f"Failed to build retrievers from snapshot {snapshot.snapshot_id}")
+
+        self.enriched_docs = snapshot.docs
+        self.embeddings = snapshot.embeddings
+        self.pinecone_retriever = dense_retriever
+        self.bm25_retriever = bm25_retriever
+        # Single reference swap; retrieve_and_rerank reads this at call time
+        self.ensemble_retriever = ensemble_retriever
+        self.snapshot_id = snapshot.snapshot_id
+        logger.info(f"Serving index snapshot {snapshot.snapshot_id}")
+
+    def refresh_snapshot(self) -> bool:
+        """
+        Hot-swap to the snapshot CURRENT points at if it differs from the one being served.
+        A snapshot that fails to load is not retried.
+
+        Returns:
+            bool: True if a newer snapshot was loaded
+        """
+        if not self.snapshot_root:
+            return False
+
+        latest_id = current_snapshot_id(self.snapshot_root)
+        if latest_id is None or latest_id == self.snapshot_id or latest_id in self._failed_snapshot_ids:
+            return False
+
+        with self._snapshot_lock:
+            # Another session may have swapped to it while this one waited for the lock
+            if latest_id == self.snapshot_id:
+                return False
+
+            try:
+                self._swap_in_snapshot(os.path.join(self.snapshot_root, latest_id))
+                return True
+            except Exception as e:
+                self._failed_snapshot_ids.add(latest_id)
+                logger.error(f"Failed to hot-swap to snapshot {latest_id}, keeping {self.snapshot_id}")
+                logger.error(f"Error details: {str(e)}")
+                return False
+
+    def export_snapshot(self, snapshot_root: str, set_current: bool = True) -> str:
+        """
+        Export chunks, generated contexts, embeddings and the BM25 index as a new snapshot.
+        Reuses the embeddings computed by the pipeline; makes no embedding calls.
+        """
+        try:
+            if self.embeddings is None:
+                raise ValueError("No chunk embeddings available to export")
+
+            snapshot_path = export_snapshot(
+                snapshot_root,
+                docs=self.enriched_docs,
+                embeddings=self.embeddings,
+                bm25_vectorizer=self.bm25_retriever.vectorizer,
+                set_current=set_current
+            )
+            return snapshot_path
+
+        except Exception as e:
+            logger.error("Fatal error in export_snapshot")
+            logger.error(f"Error details: {str(e)}")
+            raise
+
     def retrieve_and_rerank(self,input_dict):
         try:
             logger.info("Starting document retrieval and reranking")
@@ -50,6 +219,9 @@ class Driver:
     def get_rag_chain(self):
         try:
             logger.info("Initializing RAG chain")
+            from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+            from langchain_core.output_parsers import StrOutputParser
+            from langchain_core.prompts import PromptTemplate
             
             # Create prompt template
             prompt = PromptTemplate(
@@ -60,14 +232,15 @@ class Driver:
                 input_variables=["context", "question"]
             )
             
-            # Configure LLM
+            # Configure LLM; the client (and its backend import) is resolved on the first
+            # question so building the chain does not block the page
             try:
-                google_api_key = os.getenv("GOOGLE_API_KEY")
-                if not google_api_key:
-                    raise ValueError("GOOGLE_API_KEY environment variable not found")
-                    
-                llm = GoogleGenerativeAI(model="gemini-1.5-flash", api_key=google_api_key)
-                logger.debug("Successfully initialized LLM")
+                get_api_key("GOOGLE_API_KEY")
+                llm = RunnableLambda(
+                    lambda prompt_value, config: get_llm("gemini-1.5-flash").invoke(prompt_value, config=config),
+                    name="GoogleGenerativeAI"
+                )
+                logger.debug("Successfully configured LLM")
             except Exception as e:
                 logger.error("Failed to initialize LLM")
                 logger.error(f"Error details: {str(e)}")
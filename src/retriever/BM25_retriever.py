@@ -1,9 +1,32 @@
-from langchain_community.retrievers import BM25Retriever
-from langchain_core.documents import Document
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from RAG_Logger import logger
 
-def get_BM25_retriever(docs: List[Document], k: int = 10) -> Optional[BM25Retriever]:
+if TYPE_CHECKING:
+    from langchain_community.retrievers import BM25Retriever
+    from langchain_core.documents import Document
+
+def _tag_BM25_source(docs: List["Document"]) -> List["Document"]:
+    """
+    Copy the documents with search_source set to BM25, leaving the originals untouched.
+    """
+    from langchain_core.documents import Document
+
+    updated_docs = []
+    for doc in docs:
+        new_metadata = doc.metadata.copy()
+        new_metadata['search_source'] = "BM25"
+
+        # Create new document with updated metadata
+        updated_chunk = Document(
+            page_content=doc.page_content,
+            metadata=new_metadata
+        )
+
+        updated_docs.append(updated_chunk)
+    return updated_docs
+
+
+def get_BM25_retriever(docs: List["Document"], k: int = 10) -> Optional["BM25Retriever"]:
     """
     Initialize a BM25 retriever with the given documents.
     
@@ -17,19 +40,9 @@ def get_BM25_retriever(docs: List[Document], k: int = 10) -> Optional[BM25Retrie
     try:
         logger.info(f"Initializing BM25 retriever with {len(docs)} documents")
         logger.debug(f"Retrieval parameter k={k}")
-        updated_docs = []
-        for doc in docs:
-            new_metadata = doc.metadata.copy()
-            new_metadata['search_source'] = "BM25"
-
-            # Create new document with updated metadata
-            updated_chunk = Document(
-                page_content=doc.page_content,
-                metadata=new_metadata
-            )
-
-            updated_docs.append(updated_chunk)
+        from langchain_community.retrievers import BM25Retriever
 
+        updated_docs = _tag_BM25_source(docs)
         bm25_retriever = BM25Retriever.from_documents(updated_docs, k=10)
         logger.info("BM25 retriever initialized successfully")
         return bm25_retriever
@@ -38,3 +51,31 @@ def get_BM25_retriever(docs: List[Document], k: int = 10) -> Optional[BM25Retrie
         logger.error("Fatal error in BM25 retriever initialization")
         logger.error(f"Error details: {str(e)}")
         return None
+
+
+def get_BM25_retriever_from_index(vectorizer, docs: List["Document"], k: int = 10) -> Optional["BM25Retriever"]:
+    """
+    Initialize a BM25 retriever from an already built BM25 index (e.g. loaded from a snapshot),
+    skipping tokenization and index construction.
+    
+    Args:
+        vectorizer: Prebuilt rank_bm25 index over the page contents of docs
+        docs (List[Document]): Documents in the same order they were indexed
+        k (int): Number of documents to retrieve (default: 10)
+        
+    Returns:
+        Optional[BM25Retriever]: Configured BM25 retriever or None if initialization fails
+    """
+    try:
+        logger.info(f"Restoring BM25 retriever with {len(docs)} documents")
+        from langchain_community.retrievers import BM25Retriever
+
+        updated_docs = _tag_BM25_source(docs)
+        bm25_retriever = BM25Retriever(vectorizer=vectorizer, docs=updated_docs, k=k)
+        logger.info("BM25 retriever restored successfully")
+        return bm25_retriever
+    
+    except Exception as e:
+        logger.error("Fatal error in BM25 retriever restoration")
+        logger.error(f"Error details: {str(e)}")
+        return None
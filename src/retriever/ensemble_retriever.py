@@ -1,8 +1,10 @@
-from langchain.retrievers import EnsembleRetriever
 from RAG_Logger import logger
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-def get_ensemble_retriever(pinecone_retriever, bm25_retriever) -> Optional[EnsembleRetriever]:
+if TYPE_CHECKING:
+    from langchain.retrievers import EnsembleRetriever
+
+def get_ensemble_retriever(pinecone_retriever, bm25_retriever) -> Optional["EnsembleRetriever"]:
     """
     Create an ensemble retriever combining Pinecone and BM25 retrievers.
     
@@ -15,6 +17,7 @@ def get_ensemble_retriever(pinecone_retriever, bm25_retriever) -> Optional[Ensem
     """
     try:
         logger.info("Initializing ensemble retriever")
+        from langchain.retrievers import EnsembleRetriever
         
         # Validate retrievers
         if not pinecone_retriever or not bm25_retriever:
@@ -1,17 +1,22 @@
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
-from pinecone import Pinecone, ServerlessSpec
 from uuid import uuid4
-from dotenv import load_dotenv
 import time
-import os
-from typing import List, Optional
-from langchain.schema import Document
+from typing import TYPE_CHECKING, List, Optional
+from src.clients import get_embedding_model, get_pinecone_client
 from RAG_Logger import logger  # Assuming this is already properly configured
 
-load_dotenv()
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+    from langchain_pinecone import PineconeVectorStore
 
-def get_pinecone_retriever(index_name: str, chunks: List[Document]) -> Optional[PineconeVectorStore]:
+# Metadata key PineconeVectorStore reads the chunk text from
+TEXT_KEY = "text"
+
+def get_pinecone_retriever(
+    index_name: str,
+    chunks: List["Document"],
+    chunk_embeddings: Optional[List[List[float]]] = None,
+    batch_size: int = 32
+) -> Optional["PineconeVectorStore"]:
     """
     Initialize Pinecone vector database and create new index for the embeddings of transcript.
     Uses Google embeddings and converts vector database into retriever for RAG.
@@ -19,23 +24,20 @@ def get_pinecone_retriever(index_name: str, chunks: List[Document]) -> Optional[
     Args:
         index_name (str): Name of the Pinecone index
         chunks (List[Document]): List of document chunks to store
+        chunk_embeddings (Optional[List[List[float]]]): Precomputed embeddings of chunks, upserted
+            as-is instead of embedding the chunks again
+        batch_size (int): Number of vectors per upsert request
         
     Returns:
         Optional[PineconeVectorStore]: Configured retriever or None if initialization fails
     """
     try:
         logger.info(f"Initializing Pinecone retriever with index: {index_name}")
-        
-        # Get API keys
-        pinecone_api_key = os.getenv("PINECONE_API_KEY")
-        google_api_key = os.getenv('GOOGLE_API_KEY')
-        
-        if not pinecone_api_key or not google_api_key:
-            raise ValueError("Missing required API keys in environment variables")
+        from langchain_pinecone import PineconeVectorStore
+        from pinecone import ServerlessSpec
             
         # Initialize Pinecone
-        logger.debug("Connecting to Pinecone")
-        pc = Pinecone(api_key=pinecone_api_key)
+        pc = get_pinecone_client()
         
         # Check existing indexes
         existing_indexes = [index_info["name"] for index_info in pc.list_indexes()]
@@ -77,10 +79,7 @@ def get_pinecone_retriever(index_name: str, chunks: List[Document]) -> Optional[
         # Initialize embeddings
         try:
             logger.debug("Initializing Google embeddings")
-            embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/embedding-001",
-                google_api_key=google_api_key
-            )
+            embeddings = get_embedding_model("models/embedding-001")
         except Exception as e:
             logger.error("Failed to initialize Google embeddings")
             logger.error(f"Error details: {str(e)}")
@@ -89,14 +88,30 @@ def get_pinecone_retriever(index_name: str, chunks: List[Document]) -> Optional[
         # Create vector store
         try:
             logger.debug("Creating vector store")
-            vector_store = PineconeVectorStore(index=index, embedding=embeddings)
+            vector_store = PineconeVectorStore(index=index, embedding=embeddings, text_key=TEXT_KEY)
             
             # Generate UUIDs for documents
             uuids = [str(uuid4()) for _ in range(len(chunks))]
             
             # Insert documents
-            logger.info(f"Adding {len(chunks)} documents to vector store")
-            vector_store.add_documents(documents=chunks, ids=uuids)
+            if chunk_embeddings is not None:
+                if len(chunk_embeddings) != len(chunks):
+                    raise ValueError(f"Got {len(chunk_embeddings)} embeddings for {len(chunks)} chunks")
+
+                logger.info(f"Upserting {len(chunks)} precomputed embeddings to vector store")
+                vectors = [
+                    {
+                        "id": uuid,
+                        "values": [float(value) for value in vector],
+                        "metadata": {**chunk.metadata, TEXT_KEY: chunk.page_content}
+                    }
+                    for uuid, chunk, vector in zip(uuids, chunks, chunk_embeddings)
+                ]
+                for start in range(0, len(vectors), batch_size):
+                    index.upsert(vectors=vectors[start:start + batch_size])
+            else:
+                logger.info(f"Adding {len(chunks)} documents to vector store")
+                vector_store.add_documents(documents=chunks, ids=uuids)
             
             # Create retriever
             logger.debug("Configuring retriever")
@@ -0,0 +1,87 @@
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+from typing import Any, List, Optional
+from src.clients import get_embedding_model
+from RAG_Logger import logger
+import numpy as np
+
+
+class SnapshotDenseRetriever(BaseRetriever):
+    """
+    Dense retriever backed by the (memory-mapped) embedding matrix of an index snapshot.
+    Rows are expected to be L2-normalised so a dot product gives the cosine similarity.
+    The query embedding client is resolved from embedding_model_name on the first query,
+    unless an embedding_model is given, so loading a snapshot never imports the backend.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    docs: List[Document]
+    embeddings: Any
+    embedding_model_name: str = "models/embedding-001"
+    embedding_model: Any = None
+    k: int = 10
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        embedding_model = self.embedding_model or get_embedding_model(self.embedding_model_name)
+        query_vector = np.asarray(embedding_model.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm:
+            query_vector = query_vector / norm
+
+        scores = self.embeddings @ query_vector
+        k = min(self.k, len(self.docs))
+        if k == 0:
+            return []
+
+        top_indices = np.argpartition(-scores, k - 1)[:k]
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+        return [self.docs[i] for i in top_indices]
+
+
+def get_snapshot_dense_retriever(
+    docs: List[Document],
+    embeddings,
+    embedding_model: str = "models/embedding-001",
+    k: int = 10
+) -> Optional[SnapshotDenseRetriever]:
+    """
+    Initialize a dense retriever over precomputed snapshot embeddings.
+    No embedding client is built and no embedding calls are made here; only queries
+    are embedded at retrieval time.
+
+    Args:
+        docs (List[Document]): Chunks in the same order as the embedding rows
+        embeddings: Normalised embedding matrix of shape (len(docs), dimension)
+        embedding_model (str): Google embedding model the snapshot was built with
+        k (int): Number of documents to retrieve (default: 10)
+
+    Returns:
+        Optional[SnapshotDenseRetriever]: Configured retriever or None if initialization fails
+    """
+    try:
+        logger.info(f"Initializing snapshot dense retriever with {len(docs)} documents")
+
+        if len(docs) != embeddings.shape[0]:
+            raise ValueError(
+                f"Snapshot has {len(docs)} chunks but {embeddings.shape[0]} embeddings"
+            )
+
+        retriever = SnapshotDenseRetriever(
+            docs=docs,
+            embeddings=embeddings,
+            embedding_model_name=embedding_model,
+            k=k
+        )
+
+        logger.info("Snapshot dense retriever initialized successfully")
+        return retriever
+
+    except Exception as e:
+        logger.error("Fatal error in snapshot dense retriever initialization")
+        logger.error(f"Error details: {str(e)}")
+        return None
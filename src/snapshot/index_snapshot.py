@@ -0,0 +1,350 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from RAG_Logger import logger
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+
+"""
+Portable index snapshots.
+
+A snapshot is a directory holding everything needed to serve queries without
+re-running loading, enrichment, embedding or indexing:
+
+    <snapshot_root>/
+        CURRENT                  # id of the snapshot nodes should serve
+        <snapshot_id>/
+            manifest.json        # format version, models, counts, file sizes, checksums
+            chunks.jsonl         # enriched chunk texts + metadata (generated context, original chunk)
+            embeddings.npy       # float32, L2-normalised, memory-mapped on load
+            bm25.pkl             # pickled rank_bm25 index
+
+Snapshot directories are immutable once published. Publishing writes into a
+temporary directory, renames it into place and then atomically rewrites CURRENT,
+so nodes polling CURRENT never observe a half written snapshot. Only the last few
+snapshots besides CURRENT are kept, and build directories left behind by exports
+that crashed are removed once they are old enough that no export can still be
+writing them.
+
+Loading checks the manifest, file sizes and array shapes, which is cheap at any
+snapshot size; the full SHA-256 verification reads every file and is opt-in.
+"""
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+CHUNKS_FILE = "chunks.jsonl"
+EMBEDDINGS_FILE = "embeddings.npy"
+BM25_FILE = "bm25.pkl"
+CURRENT_FILE = "CURRENT"
+BUILD_DIR_PREFIX = ".build-"
+
+if TYPE_CHECKING:
+    from langchain_core.documents import Document
+
+
+@dataclass
+class IndexSnapshot:
+    snapshot_id: str
+    path: str
+    manifest: Dict[str, Any]
+    docs: List["Document"]
+    embeddings: Any
+    bm25_vectorizer: Any
+
+
+def _sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_text_atomic(file_path: str, content: str) -> None:
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+
+def resolve_snapshot_path(path: str) -> str:
+    """
+    Resolve a snapshot root (containing CURRENT) or a snapshot directory to a snapshot directory.
+
+    Args:
+        path (str): Snapshot root or snapshot directory
+
+    Returns:
+        str: Path of the snapshot directory to load
+    """
+    current_file = os.path.join(path, CURRENT_FILE)
+    if os.path.isfile(current_file):
+        with open(current_file, "r", encoding="utf-8") as f:
+            snapshot_id = f.read().strip()
+        return os.path.join(path, snapshot_id)
+
+    if os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+        return path
+
+    raise FileNotFoundError(f"No index snapshot found at: {path}")
+
+
+def export_snapshot(
+    snapshot_root: str,
+    docs: List["Document"],
+    embeddings,
+    bm25_vectorizer,
+    embedding_model: str = "models/embedding-001",
+    set_current: bool = True,
+    keep: Optional[int] = 3
+) -> str:
+    """
+    Write a new versioned, checksummed snapshot under snapshot_root.
+
+    Args:
+        snapshot_root (str): Directory holding all snapshots of this index
+        docs (List[Document]): Enriched chunks, in the same order as the embedding rows
+        embeddings: Embedding matrix of shape (len(docs), dimension)
+        bm25_vectorizer: Built rank_bm25 index over the page contents of docs
+        embedding_model (str): Google embedding model the embeddings were created with
+        set_current (bool): Point CURRENT at the new snapshot once it is written
+        keep (Optional[int]): Snapshots besides CURRENT to keep once CURRENT is updated,
+            None to keep all of them
+
+    Returns:
+        str: Path of the published snapshot directory
+    """
+    try:
+        logger.info(f"Exporting index snapshot with {len(docs)} chunks to: {snapshot_root}")
+        import numpy as np
+
+        embedding_matrix = np.asarray(embeddings, dtype=np.float32)
+        if embedding_matrix.ndim != 2 or embedding_matrix.shape[0] != len(docs):
+            raise ValueError(
+                f"Expected {len(docs)} embedding rows, got array of shape {embedding_matrix.shape}"
+            )
+
+        # Store unit vectors so the dense retriever can score with a single dot product
+        norms = np.linalg.norm(embedding_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        embedding_matrix = embedding_matrix / norms
+
+        os.makedirs(snapshot_root, exist_ok=True)
+        created_at = datetime.now(timezone.utc)
+        build_dir = os.path.join(snapshot_root, f"{BUILD_DIR_PREFIX}{os.getpid()}-{created_at.strftime('%Y%m%dT%H%M%S%fZ')}")
+        os.makedirs(build_dir)
+
+        try:
+            with open(os.path.join(build_dir, CHUNKS_FILE), "w", encoding="utf-8") as f:
+                for doc in docs:
+                    record = {"page_content": doc.page_content, "metadata": doc.metadata}
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+            np.save(os.path.join(build_dir, EMBEDDINGS_FILE), embedding_matrix)
+
+            with open(os.path.join(build_dir, BM25_FILE), "wb") as f:
+                pickle.dump(bm25_vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            data_files = (CHUNKS_FILE, EMBEDDINGS_FILE, BM25_FILE)
+            checksums = {
+                file_name: _sha256(os.path.join(build_dir, file_name))
+                for file_name in data_files
+            }
+            file_sizes = {
+                file_name: os.path.getsize(os.path.join(build_dir, file_name))
+                for file_name in data_files
+            }
+            # Sorts chronologically; the random suffix keeps concurrent exports from colliding
+            snapshot_id = f"{created_at.strftime('%Y%m%dT%H%M%S%fZ')}-{uuid.uuid4().hex[:8]}"
+
+            manifest = {
+                "format_version": SNAPSHOT_FORMAT_VERSION,
+                "snapshot_id": snapshot_id,
+                "created_at": created_at.isoformat(),
+                "num_chunks": len(docs),
+                "embedding_model": embedding_model,
+                "embedding_dimension": int(embedding_matrix.shape[1]),
+                "embeddings_normalized": True,
+                "file_sizes": file_sizes,
+                "files": checksums
+            }
+            with open(os.path.join(build_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+
+            snapshot_path = os.path.join(snapshot_root, snapshot_id)
+            os.replace(build_dir, snapshot_path)
+
+        except Exception:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+        if set_current:
+            _write_text_atomic(os.path.join(snapshot_root, CURRENT_FILE), snapshot_id + "\n")
+            if keep is not None:
+                prune_snapshots(snapshot_root, keep=keep)
+
+        logger.info(f"Successfully exported index snapshot: {snapshot_id}")
+        return snapshot_path
+
+    except Exception as e:
+        logger.error("Fatal error while exporting index snapshot")
+        logger.error(f"Error details: {str(e)}")
+        raise
+
+
+def load_snapshot(path: str, verify: bool = False) -> IndexSnapshot:
+    """
+    Load a snapshot, memory-mapping its embeddings. Makes no LLM or embedding calls.
+    Only load snapshots from trusted locations: the BM25 index is stored as a pickle.
+
+    Args:
+        path (str): Snapshot root (follows CURRENT) or snapshot directory
+        verify (bool): Also verify SHA-256 checksums, which reads every file in full
+
+    Returns:
+        IndexSnapshot: Loaded snapshot contents
+    """
+    try:
+        snapshot_path = resolve_snapshot_path(path)
+        logger.info(f"Loading index snapshot from: {snapshot_path}")
+        from langchain_core.documents import Document
+        import numpy as np
+
+        with open(os.path.join(snapshot_path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot format version {manifest.get('format_version')}, "
+                f"expected {SNAPSHOT_FORMAT_VERSION}"
+            )
+
+        snapshot_id = manifest.get("snapshot_id")
+        for file_name, expected_size in manifest["file_sizes"].items():
+            actual_size = os.path.getsize(os.path.join(snapshot_path, file_name))
+            if actual_size != expected_size:
+                raise ValueError(
+                    f"Size mismatch for {file_name} in snapshot {snapshot_id}: "
+                    f"expected {expected_size} bytes, found {actual_size}"
+                )
+
+        if verify:
+            logger.debug("Verifying snapshot checksums")
+            for file_name, expected in manifest["files"].items():
+                actual = _sha256(os.path.join(snapshot_path, file_name))
+                if actual != expected:
+                    raise ValueError(f"Checksum mismatch for {file_name} in snapshot {snapshot_id}")
+
+        docs = []
+        with open(os.path.join(snapshot_path, CHUNKS_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                docs.append(Document(page_content=record["page_content"], metadata=record["metadata"]))
+
+        embeddings = np.load(os.path.join(snapshot_path, EMBEDDINGS_FILE), mmap_mode="r")
+
+        with open(os.path.join(snapshot_path, BM25_FILE), "rb") as f:
+            bm25_vectorizer = pickle.load(f)
+
+        expected_shape = (manifest["num_chunks"], manifest["embedding_dimension"])
+        if (
+            len(docs) != manifest["num_chunks"]
+            or embeddings.shape != expected_shape
+            or embeddings.dtype != np.float32
+        ):
+            raise ValueError(f"Snapshot {snapshot_id} does not match its manifest")
+
+        logger.info(f"Successfully loaded index snapshot {manifest['snapshot_id']} with {len(docs)} chunks")
+        return IndexSnapshot(
+            snapshot_id=manifest["snapshot_id"],
+            path=snapshot_path,
+            manifest=manifest,
+            docs=docs,
+            embeddings=embeddings,
+            bm25_vectorizer=bm25_vectorizer
+        )
+
+    except Exception as e:
+        logger.error("Fatal error while loading index snapshot")
+        logger.error(f"Error details: {str(e)}")
+        raise
+
+
+def current_snapshot_id(snapshot_root: str) -> Optional[str]:
+    """
+    Read the snapshot id CURRENT points at, or None if the root has no CURRENT file.
+
+    Args:
+        snapshot_root (str): Directory holding all snapshots of this index
+
+    Returns:
+        Optional[str]: Id of the current snapshot
+    """
+    current_file = os.path.join(snapshot_root, CURRENT_FILE)
+    if not os.path.isfile(current_file):
+        return None
+    with open(current_file, "r", encoding="utf-8") as f:
+        return f.read().strip() or None
+
+
+def prune_snapshots(snapshot_root: str, keep: int = 3, stale_build_age: float = 3600) -> List[str]:
+    """
+    Delete all but the newest `keep` snapshots besides the one CURRENT points at,
+    and build directories of exports that never finished.
+    Nodes still serving a deleted snapshot are unaffected: its chunks are in memory
+    and its memory-mapped embeddings stay readable until they are unmapped.
+
+    Args:
+        snapshot_root (str): Directory holding all snapshots of this index
+        keep (int): Number of snapshots to keep in addition to CURRENT
+        stale_build_age (float): Seconds since a build directory was last modified after
+            which it is treated as left behind by a crashed export
+
+    Returns:
+        List[str]: Ids of the deleted snapshots
+    """
+    current_id = current_snapshot_id(snapshot_root)
+    entries = os.listdir(snapshot_root)
+    snapshot_ids = sorted(
+        (
+            entry for entry in entries
+            if not entry.startswith(".")
+            and entry != current_id
+            and os.path.isfile(os.path.join(snapshot_root, entry, MANIFEST_FILE))
+        ),
+        reverse=True
+    )
+
+    removed = []
+    for snapshot_id in snapshot_ids[keep:]:
+        try:
+            shutil.rmtree(os.path.join(snapshot_root, snapshot_id))
+            removed.append(snapshot_id)
+        except OSError as e:
+            logger.warning(f"Failed to remove old snapshot {snapshot_id}: {str(e)}")
+
+    if removed:
+        logger.info(f"Removed {len(removed)} old index snapshots")
+
+    # Exports in progress keep touching their build directory, so only old ones are abandoned
+    cutoff = time.time() - stale_build_age
+    for entry in entries:
+        build_dir = os.path.join(snapshot_root, entry)
+        if not entry.startswith(BUILD_DIR_PREFIX) or not os.path.isdir(build_dir):
+            continue
+        try:
+            if os.path.getmtime(build_dir) < cutoff:
+                shutil.rmtree(build_dir)
+                logger.info(f"Removed stale snapshot build directory: {entry}")
+        except OSError as e:
+            logger.warning(f"Failed to remove stale snapshot build directory {entry}: {str(e)}")
+
+    return removed
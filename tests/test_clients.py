@@ -0,0 +1,44 @@
+import pytest
+
+from src import clients
+from src.driver import warm_up
+
+FACTORIES = (
+    clients.get_llm,
+    clients.get_chat_llm,
+    clients.get_embedding_model,
+    clients.get_reranker,
+    clients.get_pinecone_client,
+)
+
+
+@pytest.fixture
+def fake_api_keys(monkeypatch):
+    # Client construction makes no network calls, so fake keys are enough
+    for name in ("GOOGLE_API_KEY", "COHERE_API_KEY", "PINECONE_API_KEY"):
+        monkeypatch.setenv(name, "test-key")
+    for factory in FACTORIES:
+        factory.cache_clear()
+    yield
+    for factory in FACTORIES:
+        factory.cache_clear()
+
+
+def test_default_and_explicit_arguments_share_a_client(fake_api_keys):
+    assert clients.get_llm() is clients.get_llm("gemini-1.5-flash")
+    assert clients.get_llm() is clients.get_llm(model="gemini-1.5-flash")
+    assert clients.get_llm() is not clients.get_llm("gemini-1.5-pro")
+
+
+def test_warm_up_builds_the_clients_requests_use(fake_api_keys):
+    warm_up(build_clients=True, background=False)
+    assert all(factory.cache_info().currsize == 1 for factory in FACTORIES)
+    warmed = [factory() for factory in FACTORIES]
+
+    # Arguments exactly as the request paths pass them
+    assert clients.get_llm("gemini-1.5-flash") is warmed[0]
+    assert clients.get_chat_llm("gemini-1.5-flash") is warmed[1]
+    assert clients.get_embedding_model("models/embedding-001") is warmed[2]
+    assert clients.get_reranker("rerank-english-v3.0") is warmed[3]
+    assert clients.get_pinecone_client() is warmed[4]
+    assert all(factory.cache_info().currsize == 1 for factory in FACTORIES)
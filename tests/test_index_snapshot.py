@@ -0,0 +1,197 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+import src.driver as driver_module
+import src.retriever.snapshot_retriever as snapshot_retriever_module
+from src.driver import Driver
+from src.retriever.BM25_retriever import get_BM25_retriever, get_BM25_retriever_from_index
+from src.retriever.snapshot_retriever import SnapshotDenseRetriever
+from src.snapshot.index_snapshot import (
+    BUILD_DIR_PREFIX,
+    CHUNKS_FILE,
+    CURRENT_FILE,
+    MANIFEST_FILE,
+    current_snapshot_id,
+    export_snapshot,
+    load_snapshot,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DIMENSION = 16
+TOPICS = ["pinecone", "cohere", "gemini", "streamlit", "bm25", "langchain"]
+
+
+class FakeEmbeddings:
+    """Embeds a query as the vector of the topic it mentions, no API calls."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_query(self, query):
+        return self.vectors[TOPICS.index(query.split()[-1])]
+
+
+def make_chunks():
+    return [
+        Document(
+            page_content=f"context for {topic}\n\nchunk about {topic}",
+            metadata={"page": i, "generated_context": f"context for {topic}", "search_source": "dense_search"}
+        )
+        for i, topic in enumerate(TOPICS)
+    ]
+
+
+def make_embeddings(seed=0):
+    return np.random.default_rng(seed).normal(size=(len(TOPICS), DIMENSION))
+
+
+def export(root, docs=None, embeddings=None, **kwargs):
+    docs = docs or make_chunks()
+    embeddings = make_embeddings() if embeddings is None else embeddings
+    bm25 = get_BM25_retriever(docs)
+    return export_snapshot(str(root), docs, embeddings, bm25.vectorizer, **kwargs)
+
+
+def test_export_load_retrieve_round_trip(tmp_path):
+    docs = make_chunks()
+    embeddings = make_embeddings()
+    snapshot_path = export(tmp_path, docs, embeddings)
+
+    assert current_snapshot_id(str(tmp_path)) == os.path.basename(snapshot_path)
+
+    snapshot = load_snapshot(str(tmp_path), verify=True)
+    assert [doc.page_content for doc in snapshot.docs] == [doc.page_content for doc in docs]
+    assert [doc.metadata for doc in snapshot.docs] == [doc.metadata for doc in docs]
+    assert isinstance(snapshot.embeddings, np.memmap)
+    assert snapshot.embeddings.shape == (len(TOPICS), DIMENSION)
+    assert np.allclose(np.linalg.norm(snapshot.embeddings, axis=1), 1.0)
+
+    dense = SnapshotDenseRetriever(
+        docs=snapshot.docs,
+        embeddings=snapshot.embeddings,
+        embedding_model=FakeEmbeddings(embeddings),
+        k=2
+    )
+    assert dense.invoke("about gemini")[0].metadata["page"] == TOPICS.index("gemini")
+
+    bm25 = get_BM25_retriever_from_index(snapshot.bm25_vectorizer, snapshot.docs, k=1)
+    result = bm25.invoke("cohere")[0]
+    assert result.metadata["page"] == TOPICS.index("cohere")
+    assert result.metadata["search_source"] == "BM25"
+
+
+def test_load_rejects_truncated_file(tmp_path):
+    snapshot_path = export(tmp_path)
+    with open(os.path.join(snapshot_path, CHUNKS_FILE), "a", encoding="utf-8") as f:
+        f.write("\n")
+
+    with pytest.raises(ValueError, match="Size mismatch"):
+        load_snapshot(str(tmp_path))
+
+
+def test_verify_detects_same_size_corruption(tmp_path):
+    snapshot_path = export(tmp_path)
+    chunks_file = os.path.join(snapshot_path, CHUNKS_FILE)
+    with open(chunks_file, "r", encoding="utf-8") as f:
+        content = f.read()
+    with open(chunks_file, "w", encoding="utf-8") as f:
+        f.write(content.replace("pinecone", "pinecane"))
+
+    load_snapshot(str(tmp_path))
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        load_snapshot(str(tmp_path), verify=True)
+
+
+def test_load_rejects_unknown_format_version(tmp_path):
+    snapshot_path = export(tmp_path)
+    manifest_file = os.path.join(snapshot_path, MANIFEST_FILE)
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["format_version"] = 999
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError, match="Unsupported snapshot format version"):
+        load_snapshot(str(tmp_path))
+
+
+def test_repeated_exports_get_unique_ids_and_old_ones_are_pruned(tmp_path):
+    paths = [export(tmp_path, keep=2) for _ in range(5)]
+
+    assert len(set(paths)) == 5
+    remaining = sorted(entry for entry in os.listdir(tmp_path) if entry != CURRENT_FILE)
+    assert remaining == sorted(os.path.basename(path) for path in paths[-3:])
+    assert current_snapshot_id(str(tmp_path)) == os.path.basename(paths[-1])
+
+
+def test_export_removes_stale_build_directories(tmp_path):
+    stale_build = tmp_path / f"{BUILD_DIR_PREFIX}1234-20240101T000000000000Z"
+    fresh_build = tmp_path / f"{BUILD_DIR_PREFIX}5678-20240101T000000000000Z"
+    for build_dir in (stale_build, fresh_build):
+        build_dir.mkdir()
+        (build_dir / CHUNKS_FILE).write_text("partial\n", encoding="utf-8")
+    two_hours_ago = time.time() - 2 * 3600
+    os.utime(stale_build, (two_hours_ago, two_hours_ago))
+
+    export(tmp_path)
+
+    assert not stale_build.exists()
+    assert fresh_build.exists()
+
+
+def test_driver_hot_swaps_and_skips_broken_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        snapshot_retriever_module, "get_embedding_model", lambda model: FakeEmbeddings(make_embeddings())
+    )
+    load_calls = []
+    real_load_snapshot = driver_module.load_snapshot
+
+    def counting_load_snapshot(path, verify=False):
+        load_calls.append(path)
+        return real_load_snapshot(path, verify=verify)
+
+    monkeypatch.setattr(driver_module, "load_snapshot", counting_load_snapshot)
+
+    first = os.path.basename(export(tmp_path))
+    driver = Driver(snapshot_path=str(tmp_path))
+    assert driver.snapshot_id == first
+    assert driver.refresh_snapshot() is False
+
+    second = os.path.basename(export(tmp_path))
+    assert driver.refresh_snapshot() is True
+    assert driver.snapshot_id == second
+    assert driver.ensemble_retriever.invoke("about streamlit")
+
+    broken_path = export(tmp_path)
+    with open(os.path.join(broken_path, CHUNKS_FILE), "a", encoding="utf-8") as f:
+        f.write("\n")
+
+    calls_before = len(load_calls)
+    assert driver.refresh_snapshot() is False
+    assert driver.refresh_snapshot() is False
+    assert driver.snapshot_id == second
+    assert len(load_calls) == calls_before + 1
+
+
+def test_cold_start_from_snapshot_does_not_import_embedding_backend(tmp_path):
+    export(tmp_path)
+    script = (
+        "import sys\n"
+        "from src.driver import Driver\n"
+        f"Driver(snapshot_path={str(tmp_path)!r})\n"
+        "print('langchain_google_genai' in sys.modules)\n"
+    )
+    # Run outside the repo so the app logger writes its logs/ under tmp_path
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=str(tmp_path), env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False"
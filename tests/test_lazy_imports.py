@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_BACKENDS = (
+    "langchain_google_genai",
+    "langchain_pinecone",
+    "pinecone",
+    "langchain_cohere",
+    "langchain_community",
+    "rank_bm25",
+)
+
+
+def test_importing_driver_does_not_import_heavy_backends(tmp_path):
+    script = (
+        "import json, sys\n"
+        "import src.driver\n"
+        f"print(json.dumps([name for name in {HEAVY_BACKENDS!r} if name in sys.modules]))\n"
+    )
+    # A fresh interpreter, run outside the repo so nothing is written to it
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=str(tmp_path), env=env, capture_output=True, text=True, check=True
+    )
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+    assert not os.path.exists(os.path.join(str(tmp_path), "logs"))